@@ -1,17 +1,45 @@
 """
 Lambda function to authenticate a user and return OAuth 2.0 token
 """
-import json
+import logging
 import os
-import sys
-from datetime import datetime
+from datetime import datetime, timezone
 
-# Add lambda-functions directory to path
-sys.path.append(os.path.dirname(__file__))
+import orjson
 
 from db_utils import get_user_by_email
 from auth_utils import verify_password, generate_access_token, create_oauth_response
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+
+def _body(obj):
+    return orjson.dumps(obj).decode('utf-8')
+
+
+# Response headers and fixed error responses, built once per container
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+_LOGIN_HEADERS = {
+    **_CORS_HEADERS,
+    'Cache-Control': 'no-store',
+    'Pragma': 'no-cache'
+}
+
+_ERR_MISSING_FIELDS = {
+    'statusCode': 400,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Email and password are required'})
+}
+_ERR_INVALID_CREDENTIALS = {
+    'statusCode': 401,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Invalid credentials'})
+}
+
 
 def lambda_handler(event, context):
     """
@@ -39,52 +67,25 @@ def lambda_handler(event, context):
         body = event.get('body', {})
         
         if isinstance(body, str):
-            body = json.loads(body)
+            body = orjson.loads(body)
 
         email = body.get('email')
         password = body.get('password')
         
         # Validate required fields
         if not email or not password:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Email and password are required'
-                })
-            }
+            return _ERR_MISSING_FIELDS
         
         # Get user from database
         user = get_user_by_email(email)
         
         if not user:
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Invalid credentials'
-                })
-            }
+            return _ERR_INVALID_CREDENTIALS
         
         # Verify password
         password_hash = user.get('passwordHash')
         if not verify_password(password, password_hash):
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Invalid credentials'
-                })
-            }
+            return _ERR_INVALID_CREDENTIALS
         
         # Generate access token
         user_id = user.get('userId')
@@ -93,28 +94,20 @@ def lambda_handler(event, context):
         # Create OAuth 2.0 compliant response
         oauth_response = create_oauth_response(access_token)
         
-        oauth_response['timestamp'] = datetime.utcnow().isoformat() + 'Z'
+        oauth_response['timestamp'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
         # Return success response
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Cache-Control': 'no-store',
-                'Pragma': 'no-cache'
-            },
-            'body': json.dumps(oauth_response)
+            'headers': _LOGIN_HEADERS,
+            'body': _body(oauth_response)
         }
         
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.exception("Error authenticating user")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _body({
                 'error': 'Internal server error',
                 'details': str(e)
             })
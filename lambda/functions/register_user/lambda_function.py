@@ -1,17 +1,66 @@
 """
 Lambda function to register a new user
 """
-import json
-import uuid
+import concurrent.futures
+import logging
 import os
-import sys
+import re
+import uuid
 
-# Add lambda-functions directory to path
-sys.path.append(os.path.dirname(__file__))
+import orjson
 
-from db_utils import create_user, get_user_by_email
+from db_utils import create_user, get_user_by_email, UserAlreadyExistsError
 from auth_utils import hash_password
 
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+# Until the email lock table is backfilled, existing accounts are only
+# found through the email index
+EMAIL_LOCK_BACKFILLED = os.environ.get('EMAIL_LOCK_BACKFILLED', 'false').lower() == 'true'
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# bcrypt releases the GIL, so hashing overlaps with the DynamoDB lookup
+_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+def _body(obj):
+    return orjson.dumps(obj).decode('utf-8')
+
+
+# Response headers and fixed error responses, built once per container
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+_ERR_MISSING_FIELDS = {
+    'statusCode': 400,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Email and password are required'})
+}
+_ERR_INVALID_EMAIL = {
+    'statusCode': 400,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Invalid email format'})
+}
+_ERR_PASSWORD_TOO_SHORT = {
+    'statusCode': 400,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Password must be at least 8 characters long'})
+}
+_ERR_USER_EXISTS = {
+    'statusCode': 409,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'User with this email already exists'})
+}
+_ERR_CREATE_FAILED = {
+    'statusCode': 500,
+    'headers': _CORS_HEADERS,
+    'body': _body({'error': 'Failed to create user'})
+}
+
 
 def lambda_handler(event, context):
     """
@@ -38,7 +87,7 @@ def lambda_handler(event, context):
         body = event.get('body', {})
         
         if isinstance(body, str):
-            body = json.loads(body)   
+            body = orjson.loads(body)   
 
         email = body.get('email')
         password = body.get('password')
@@ -47,105 +96,57 @@ def lambda_handler(event, context):
         
         # Validate required fields
         if not email or not password:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Email and password are required'
-                })
-            }
+            return _ERR_MISSING_FIELDS
         
         # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Invalid email format'
-                })
-            }
+        if not _EMAIL_RE.match(email):
+            return _ERR_INVALID_EMAIL
         
         # Validate password strength
         if len(password) < 8:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Password must be at least 8 characters long'
-                })
-            }
+            return _ERR_PASSWORD_TOO_SHORT
         
-        # Check if user already exists
-        existing_user = get_user_by_email(email)
-        if existing_user:
-            return {
-                'statusCode': 409,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'User with this email already exists'
-                })
-            }
+        # Start hashing while checking if user already exists. Once the lock
+        # table is backfilled, the transactional write alone catches this.
+        hash_fut = _POOL.submit(hash_password, password)
+        if not EMAIL_LOCK_BACKFILLED and get_user_by_email(email):
+            hash_fut.cancel()
+            return _ERR_USER_EXISTS
         
-        user_id = str(uuid.uuid4())
-        password_hash = hash_password(password)
+        user_id = uuid.uuid4().hex
+        password_hash = hash_fut.result()
         
-        # Create user in DynamoDB
-        success = create_user(
-            user_id=user_id,
-            email=email,
-            first_name=first_name,
-            last_name=last_name,
-            password_hash=password_hash,
-        )
+        # Create user in DynamoDB; the write fails if the email is taken
+        try:
+            success = create_user(
+                user_id=user_id,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                password_hash=password_hash,
+            )
+        except UserAlreadyExistsError:
+            return _ERR_USER_EXISTS
         
         if not success:
-            return {
-                'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Failed to create user'
-                })
-            }
+            return _ERR_CREATE_FAILED
         
         # Return success response
         return {
             'statusCode': 201,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _body({
                 'message': 'User created successfully',
                 'userId': user_id
             })
         }
         
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.exception("Error registering user")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _CORS_HEADERS,
+            'body': _body({
                 'error': 'Internal server error',
                 'details': str(e)
             })
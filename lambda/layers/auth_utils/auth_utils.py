@@ -2,11 +2,17 @@
 Authentication utilities for password hashing and JWT token generation
 """
 import os
+import time
+import base64
+import hashlib
+import hmac
+import json
 import jwt
 import bcrypt
 import boto3
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from typing import Dict, Any, Tuple
 from functools import lru_cache
 
 # JWT Configuration
@@ -22,13 +28,29 @@ def get_jwt_secret():
     return response['Parameter']['Value']
 
 JWT_SECRET = get_jwt_secret()
+_JWT_SECRET_BYTES = JWT_SECRET.encode('utf-8')
 JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'HS256')
 JWT_EXPIRATION_HOURS = int(os.environ.get('JWT_EXPIRATION_HOURS', 24))
+_JWT_EXP_SECONDS = JWT_EXPIRATION_HOURS * 3600
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# Static HS256 header segment, encoded once per container
+_HS256_HEADER = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode('utf-8'))
+
+# Password hashing configuration
+PW_SCHEME = os.environ.get('PW_SCHEME', 'bcrypt').lower()
+BCRYPT_COST = int(os.environ.get('BCRYPT_COST', 12))
+
+_ph = PasswordHasher(time_cost=3, memory_cost=19456, parallelism=1)
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password using bcrypt, or Argon2id when PW_SCHEME=argon2id
     
     Args:
         password: Plain text password
@@ -36,14 +58,17 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    salt = bcrypt.gensalt()
+    if PW_SCHEME == 'argon2id':
+        return _ph.hash(password)
+
+    salt = bcrypt.gensalt(rounds=BCRYPT_COST)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """
-    Verify a password against a hash
+    Verify a password against a bcrypt or Argon2id hash
     
     Args:
         password: Plain text password to verify
@@ -52,6 +77,12 @@ def verify_password(password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    if hashed_password.startswith('$argon2id$'):
+        try:
+            return _ph.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
     return bcrypt.checkpw(
         password.encode('utf-8'),
         hashed_password.encode('utf-8')
@@ -70,18 +101,45 @@ def generate_access_token(user_id: str, email: str, additional_claims: Dict[str,
     Returns:
         JWT token string
     """
+    iat = int(time.time())
     payload = {
         'sub': user_id,
         'email': email,
-        'iat': datetime.utcnow(),
-        'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
+        'iat': iat,
+        'exp': iat + _JWT_EXP_SECONDS,
         'token_type': 'Bearer'
     }
     
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    if JWT_ALGORITHM == 'HS256':
+        return _encode_hs256(payload)
+
+    token = jwt.encode(payload, _JWT_SECRET_BYTES, algorithm=JWT_ALGORITHM)
     return token
 
 
+def _encode_hs256(payload: Dict[str, Any]) -> str:
+    """
+    Sign an HS256 JWT directly with hmac, reusing the precomputed header
+    
+    Args:
+        payload: JSON-serializable token claims
+        
+    Returns:
+        JWT token string
+    """
+    signing_input = _HS256_HEADER + b'.' + _b64url(
+        json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    )
+    signature = hmac.new(_JWT_SECRET_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64url(signature)).decode('ascii')
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str) -> Tuple[Tuple[str, Any], ...]:
+    # Signature checks are cached per token; expiry is re-checked by the caller
+    return tuple(sorted(jwt.decode(token, _JWT_SECRET_BYTES, algorithms=[JWT_ALGORITHM]).items()))
+
+
 def verify_access_token(token: str) -> Dict[str, Any]:
     """
     Verify and decode a JWT access token
@@ -97,13 +155,16 @@ def verify_access_token(token: str) -> Dict[str, Any]:
         jwt.InvalidTokenError: If token is invalid
     """
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = dict(_decode_cached(token))
     except jwt.ExpiredSignatureError:
         raise Exception("Token has expired")
     except jwt.InvalidTokenError:
         raise Exception("Invalid token")
 
+    if 'exp' in payload and payload['exp'] <= time.time():
+        raise Exception("Token has expired")
+    return payload
+
 
 def create_oauth_response(access_token: str) -> Dict[str, Any]:
     """
@@ -118,6 +179,6 @@ def create_oauth_response(access_token: str) -> Dict[str, Any]:
     return {
         'access_token': access_token,
         'token_type': 'Bearer',
-        'expires_in': JWT_EXPIRATION_HOURS * 3600,  # Convert hours to seconds
+        'expires_in': _JWT_EXP_SECONDS,
         'scope': 'read write'
     }
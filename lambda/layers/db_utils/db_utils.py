@@ -1,21 +1,63 @@
 """
 Shared utilities for DynamoDB operations and KMS encryption
 """
+import logging
 import os
+import time
 import boto3
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
 from boto3.dynamodb.conditions import Key
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
+logger = logging.getLogger(__name__)
+
+# Initialize AWS clients once per container, reusing pooled keep-alive connections
+_cfg = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    connect_timeout=1.0,
+    read_timeout=3.0,
+    tcp_keepalive=True
+)
+dynamodb = boto3.resource('dynamodb', config=_cfg)
 
 # Environment variables
 TABLE_NAME = os.environ.get('DYNAMODB_TABLE_NAME', 'users')
+EMAIL_LOCK_TABLE_NAME = os.environ.get('EMAIL_LOCK_TABLE_NAME', 'users-email')
 
 table = dynamodb.Table(TABLE_NAME)
 
+# Short-lived, size-bounded per-container cache of users looked up by email.
+# Entries are kept in insertion order, so the oldest is always first.
+_USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '2.0'))
+_USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', '1024'))
+_user_cache: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+
+
+def _cache_user(email: str, user: Dict[str, Any]) -> None:
+    """
+    Cache a user, evicting expired entries and the oldest beyond the size cap
+    
+    Args:
+        email: User's email address
+        user: User data returned by the email lookup
+    """
+    now = time.monotonic()
+    while _user_cache:
+        inserted_at = next(iter(_user_cache.values()))[0]
+        if now - inserted_at < _USER_CACHE_TTL and len(_user_cache) < _USER_CACHE_MAX_SIZE:
+            break
+        _user_cache.popitem(last=False)
+
+    _user_cache[email] = (now, user)
+
+
+class UserAlreadyExistsError(Exception):
+    """Raised when a user with the same email or userId already exists"""
+
 
 def create_user(
         user_id: str,
@@ -26,6 +68,9 @@ def create_user(
     """
     Create a new user in DynamoDB
     
+    The user item and an email lock item are written in one transaction,
+    so email uniqueness is enforced by the write itself.
+    
     Args:
         user_id: Unique user identifier
         email: User's email address
@@ -34,49 +79,82 @@ def create_user(
         
     Returns:
         True if successful, False otherwise
+        
+    Raises:
+        UserAlreadyExistsError: If the email or userId is already taken
     """
     try:
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
         item = {
             'userId': user_id,
             'email': email,
             'firstName': first_name,
             'lastName': last_name,
             'passwordHash': password_hash,
-            'createdAt': datetime.now(datetime.timezone.utc).isoformat(),
-            'updatedAt': datetime.now(datetime.timezone.utc).isoformat()
+            'createdAt': now,
+            'updatedAt': now
         }
         
-        table.put_item(
-            Item=item,
-            ConditionExpression='attribute_not_exists(userId)'
+        dynamodb.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'Put': {
+                        'TableName': TABLE_NAME,
+                        'Item': item,
+                        'ConditionExpression': 'attribute_not_exists(userId)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': EMAIL_LOCK_TABLE_NAME,
+                        'Item': {'email': email, 'userId': user_id},
+                        'ConditionExpression': 'attribute_not_exists(email)'
+                    }
+                }
+            ]
         )
+        _user_cache.pop(email, None)
         return True
     except ClientError as e:
-        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-            print(f"User {user_id} already exists")
-        else:
-            print(f"Error creating user: {e}")
+        if e.response['Error']['Code'] == 'TransactionCanceledException':
+            reasons = e.response.get('CancellationReasons', [])
+            if any(r.get('Code') == 'ConditionalCheckFailed' for r in reasons):
+                logger.info("User %s already exists", user_id)
+                raise UserAlreadyExistsError(user_id) from e
+        logger.error("Error creating user: %s", e)
         return False
 
 
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
-    Retrieve a user by email address
+    Retrieve a user's credentials by email address
     
     Args:
         email: User's email address
         
     Returns:
-        User data if found, None otherwise
+        Dict with userId and passwordHash if found, None otherwise
     """
+    cached = _user_cache.get(email)
+    if cached:
+        if time.monotonic() - cached[0] < _USER_CACHE_TTL:
+            return cached[1]
+        del _user_cache[email]
+
     try:
         response = table.query(
-            IndexName='Email_Index',
-            KeyConditionExpression=Key('email').eq(email)
+            IndexName='Email_Index_v2',
+            KeyConditionExpression=Key('email').eq(email),
+            ProjectionExpression='userId, passwordHash',
+            Limit=1
         )
         
         items = response.get('Items', [])
-        return items[0] if items else None
+        if not items:
+            return None
+
+        _cache_user(email, items[0])
+        return items[0]
     except ClientError as e:
-        print(f"Error getting user: {e}")
+        logger.error("Error getting user: %s", e)
         return None
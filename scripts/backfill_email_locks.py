@@ -0,0 +1,74 @@
+"""
+One-off backfill of the email lock table from the users table
+
+Users created before the email lock table existed have no lock item, so
+register_user keeps checking the email index until this has been run and
+the stack is redeployed with EmailLockBackfilled=true.
+
+Usage:
+    python scripts/backfill_email_locks.py --environment dev
+"""
+import argparse
+import boto3
+from typing import Dict
+from botocore.exceptions import ClientError
+
+
+def backfill_email_locks(users_table_name: str, lock_table_name: str) -> Dict[str, int]:
+    """
+    Write an email lock item for every user that does not have one yet
+    
+    Args:
+        users_table_name: Name of the users table to scan
+        lock_table_name: Name of the email lock table to fill
+        
+    Returns:
+        Counts of locks written, locks already present and duplicate emails
+    """
+    dynamodb = boto3.resource('dynamodb')
+    users = dynamodb.Table(users_table_name)
+    locks = dynamodb.Table(lock_table_name)
+
+    counts = {'written': 0, 'existing': 0, 'duplicates': 0}
+    scan_kwargs = {'ProjectionExpression': 'userId, email'}
+
+    while True:
+        response = users.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            try:
+                locks.put_item(
+                    Item={'email': item['email'], 'userId': item['userId']},
+                    ConditionExpression='attribute_not_exists(email)'
+                )
+                counts['written'] += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+
+                owner = locks.get_item(Key={'email': item['email']})['Item']['userId']
+                if owner == item['userId']:
+                    counts['existing'] += 1
+                else:
+                    counts['duplicates'] += 1
+                    print(f"Duplicate email: user {item['userId']} shares an email with lock owner {owner}")
+
+        if 'LastEvaluatedKey' not in response:
+            return counts
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill the email lock table from the users table')
+    parser.add_argument('--environment', default='dev', help='Stack environment name (dev, prod, etc)')
+    args = parser.parse_args()
+
+    counts = backfill_email_locks(
+        users_table_name=f'users-{args.environment}',
+        lock_table_name=f'users-email-{args.environment}'
+    )
+    print(f"Written: {counts['written']}, already present: {counts['existing']}, duplicates: {counts['duplicates']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Tests for the HS256 access token encoder in the auth_utils layer
+"""
+import importlib
+import os
+import sys
+import time
+from unittest import mock
+
+import jwt
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'layers', 'auth_utils'))
+
+
+@pytest.fixture(scope='module')
+def auth_utils():
+    # auth_utils reads the JWT secret from SSM at import time
+    ssm = mock.Mock()
+    ssm.get_parameter.return_value = {'Parameter': {'Value': 'test-secret'}}
+
+    with mock.patch.dict(os.environ, {'JWT_ALGORITHM': 'HS256'}), \
+            mock.patch('boto3.client', return_value=ssm):
+        sys.modules.pop('auth_utils', None)
+        yield importlib.import_module('auth_utils')
+    sys.modules.pop('auth_utils', None)
+
+
+def test_encode_hs256_round_trips_through_pyjwt(auth_utils):
+    now = int(time.time())
+    payload = {
+        'sub': 'user-id',
+        'email': 'user@example.com',
+        'iat': now,
+        'exp': now + 3600,
+        'token_type': 'Bearer'
+    }
+
+    token = auth_utils._encode_hs256(payload)
+
+    assert jwt.get_unverified_header(token) == {'alg': 'HS256', 'typ': 'JWT'}
+    assert jwt.decode(token, auth_utils._JWT_SECRET_BYTES, algorithms=['HS256']) == payload
+
+
+def test_encode_hs256_rejects_tampered_signature(auth_utils):
+    now = int(time.time())
+    token = auth_utils._encode_hs256({'sub': 'user-id', 'iat': now, 'exp': now + 3600})
+
+    header, payload, signature = token.split('.')
+    tampered = '.'.join([header, payload, ('A' if signature[0] != 'A' else 'B') + signature[1:]])
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(tampered, auth_utils._JWT_SECRET_BYTES, algorithms=['HS256'])
+
+
+def test_generate_access_token_uses_hs256_encoder(auth_utils):
+    token = auth_utils.generate_access_token('user-id', 'user@example.com')
+
+    claims = jwt.decode(token, auth_utils._JWT_SECRET_BYTES, algorithms=['HS256'])
+    assert claims['sub'] == 'user-id'
+    assert claims['exp'] - claims['iat'] == auth_utils._JWT_EXP_SECONDS